@@ -1,16 +1,20 @@
 # app/api/routes.py
 from __future__ import annotations
 
+import io
+import mmap
 import os
+import re
 from typing import Literal
 
 import anyio
-from fastapi import APIRouter, Query, Request, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from starlette.datastructures import UploadFile
 
 from app.models.state import ExhaleResponse, InhaleResponse, SigilState
+from app.core.jsonio import JsonBlob
 from app.core.state_store import get_store, SigilStateStore
 
 
@@ -35,6 +39,12 @@ _MAX_INLINE_URLS = max(1, int(os.getenv("KAI_MAX_INLINE_URLS", "20000")))
 # Response models for non-Pydantic dict routes
 # ──────────────────────────────────────────────────────────────────────
 
+# Routes return response models via model_construct (trusted store values).
+# That skips OUR validation copy of the N-sized url lists; what FastAPI does with
+# the instance afterwards depends on its version: >=0.128 validates it against
+# response_model by instance check (no re-walk), older releases model_dump() it and
+# re-validate the dict (full walk, same response bytes).
+
 class SealResponse(BaseModel):
     seal: str = Field(..., description="Determinate state seal (ETag candidate)")
 
@@ -112,10 +122,81 @@ async def _collect_uploads(request: Request) -> list[UploadFile]:
     return uploads
 
 
-async def _read_upload_capped(up: UploadFile, *, max_bytes: int) -> tuple[bytes | None, list[str]]:
+def _map_spooled_upload(up: UploadFile) -> mmap.mmap | None:
+    """
+    Map the upload's backing file read-only instead of reading it back into RAM.
+    Spooled uploads past the multipart limit already live in a temp file; a
+    still-in-memory spool is rolled over by fileno() (one copy into the page cache,
+    same as reading it out). Returns None when the object has no usable file
+    descriptor or is empty; the caller then streams it with up.read().
+    """
+    f = up.file
+    try:
+        f.flush()
+        fd = f.fileno()
+        if os.fstat(fd).st_size <= 0:
+            return None
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (io.UnsupportedOperation, OSError, ValueError):
+        return None
+
+
+# First non-whitespace byte of an upload; must open a JSON object/array/string
+_FIRST_NON_WS_RE = re.compile(rb"\S")
+_JSON_START_BYTES = frozenset(b'{["')
+
+
+def _json_start_verdict(head: JsonBlob) -> bool | None:
+    """
+    Cheap shape sniff (no parse): True / False once a non-whitespace byte is seen,
+    None while the buffer is whitespace-only so far.
+    """
+    m = _FIRST_NON_WS_RE.search(head)
+    if m is None:
+        return None
+    return m.group()[0] in _JSON_START_BYTES
+
+
+def _declared_upload_size(up: UploadFile) -> int | None:
+    """Size known before any read(): multipart part size or its Content-Length."""
+    if isinstance(up.size, int):
+        return up.size
+    raw = (up.headers.get("content-length") or "").strip() if up.headers else ""
+    return int(raw) if raw.isdigit() else None
+
+
+def _skip(notes: list[str], name: str, reason: str) -> tuple[None, list[str]]:
+    """Fail-soft skip: keep the notes already collected for this file, add why it was skipped."""
+    notes.append(f"{name}: {reason}")
+    notes.append(f"{name}: skipped")
+    return (None, notes)
+
+
+def _skip_too_large(notes: list[str], name: str, size: int, max_bytes: int) -> tuple[None, list[str]]:
+    return _skip(notes, name, f"file too large ({size} bytes) exceeds max_bytes_per_file={max_bytes}.")
+
+
+def _skip_not_json(notes: list[str], name: str) -> tuple[None, list[str]]:
+    return _skip(notes, name, "not a JSON krystal (must start with '{', '[' or '\"')")
+
+
+async def _close_quietly(up: UploadFile) -> None:
+    try:
+        await up.close()
+    except Exception:
+        pass
+
+
+async def _read_upload_capped(up: UploadFile, *, max_bytes: int) -> tuple[JsonBlob | None, list[str]]:
     """
     Stream-read with hard cap.
-    Returns (bytes_or_none, notes). Notes may include warnings or fail-soft reasons.
+    Returns (blob_or_none, notes). Notes may include warnings or fail-soft reasons.
+
+    The blob is never copied: disk-spooled uploads are handed over as a read-only
+    mmap, in-memory uploads as a memoryview over the single read buffer.
+
+    Fail-fast (before buffering/parsing): a declared size over the cap, or a first
+    non-whitespace byte that cannot start JSON, skips the file immediately.
     """
     name = up.filename or "krystal.json"
     notes: list[str] = []
@@ -124,31 +205,45 @@ async def _read_upload_capped(up: UploadFile, *, max_bytes: int) -> tuple[bytes
     if ctype and ctype not in ("application/json", "application/octet-stream"):
         notes.append(f"{name}: unexpected content-type '{up.content_type}' (still attempting JSON parse).")
 
+    declared = _declared_upload_size(up)
+    if declared is not None and declared > max_bytes:
+        await _close_quietly(up)
+        return _skip_too_large(notes, name, declared, max_bytes)
+
+    mapped = _map_spooled_upload(up)
+    if mapped is not None:
+        await _close_quietly(up)
+        if len(mapped) > max_bytes:
+            size = len(mapped)
+            mapped.close()
+            return _skip_too_large(notes, name, size, max_bytes)
+        if _json_start_verdict(mapped) is False:
+            mapped.close()
+            return _skip_not_json(notes, name)
+        return (mapped, notes)
+
     buf = bytearray()
+    sniffed = False
     try:
         while True:
             chunk = await up.read(_READ_CHUNK_BYTES)
             if not chunk:
                 break
+            if not sniffed:
+                verdict = _json_start_verdict(chunk)
+                if verdict is False:
+                    return _skip_not_json(notes, name)
+                sniffed = verdict is True
             buf.extend(chunk)
             if len(buf) > max_bytes:
-                return (
-                    None,
-                    [
-                        f"{name}: file too large ({len(buf)} bytes) exceeds max_bytes_per_file={max_bytes}.",
-                        f"{name}: skipped",
-                    ],
-                )
+                return _skip_too_large(notes, name, len(buf), max_bytes)
     finally:
-        try:
-            await up.close()
-        except Exception:
-            pass
+        await _close_quietly(up)
 
     if not buf:
-        return (None, [f"{name}: empty file", f"{name}: skipped"])
+        return _skip(notes, name, "empty file")
 
-    return (bytes(buf), notes)
+    return (memoryview(buf), notes)
 
 
 def _store_seal(store: object) -> str:
@@ -167,6 +262,16 @@ def _store_seal(store: object) -> str:
     return s2
 
 
+async def _request_store(request: Request) -> SigilStateStore:
+    """
+    The process store bound at app startup (lifespan → app.state.store).
+    async on purpose: a sync dependency would cost a threadpool hop per request.
+    Falls back to get_store() for apps mounting the router without that lifespan.
+    """
+    store = getattr(request.app.state, "store", None)
+    return store if store is not None else get_store()
+
+
 def _store_urls_page(store: object, *, offset: int, limit: int) -> tuple[list[str], int]:
     """
     Preferred: store.exhale_urls_page(offset, limit) -> (page, total).
@@ -209,6 +314,7 @@ async def inhale(
         le=100_000_000,
         description="Safety cap per file (bytes). Oversized files fail-soft (skipped) and do not block others.",
     ),
+    store: SigilStateStore = Depends(_request_store),
 ) -> InhaleResponse:
     async with _INHALE_SEM:
         uploads = await _collect_uploads(request)
@@ -216,7 +322,7 @@ async def inhale(
             # Keep `.status` contract
             return _inhale_error(message="No files received for inhale.", status_code=400)  # type: ignore[return-value]
 
-        file_blobs: list[tuple[str, bytes]] = []
+        file_blobs: list[tuple[str, JsonBlob]] = []
         soft_notes: list[str] = []
         total_uploads = len(uploads)
 
@@ -237,8 +343,6 @@ async def inhale(
                 errors=(soft_notes if soft_notes else None),
             )  # type: ignore[return-value]
 
-        store = get_store()
-
         # Merge off event loop
         report = await anyio.to_thread.run_sync(store.inhale_files, file_blobs)
 
@@ -268,10 +372,14 @@ async def inhale(
                 errors.append(
                     f"urls suppressed: registry_urls={registry_urls} exceeds KAI_MAX_INLINE_URLS={_MAX_INLINE_URLS}. Use GET /sigils/urls paging."
                 )
+            elif state is not None:
+                # same Kai-ordered list the state carries — share it, don't refetch/copy
+                urls = state.urls
             else:
                 urls = store.exhale_urls()
 
-        return InhaleResponse(
+        # Trusted internal values: skip validation (it would copy `urls` element-wise)
+        return InhaleResponse.model_construct(
             status="ok",
             files_received=total_uploads,
             crystals_total=report.crystals_total,
@@ -291,8 +399,11 @@ async def inhale(
     response_model=SealResponse,
     responses={304: {"description": "Not Modified"}},
 )
-def seal(request: Request, response: Response) -> SealResponse | Response:
-    store = get_store()
+def seal(
+    request: Request,
+    response: Response,
+    store: SigilStateStore = Depends(_request_store),
+) -> SealResponse | Response:
     s = _store_seal(store)
     etag = _etag_from_seal(s)
 
@@ -319,7 +430,7 @@ async def merge(
     if not uploads:
         return ExhaleResponse(status="ok", mode=mode, urls=[], state=None)
 
-    file_blobs: list[tuple[str, bytes]] = []
+    file_blobs: list[tuple[str, JsonBlob]] = []
     for up in uploads:
         blob, _notes = await _read_upload_capped(up, max_bytes=max_bytes_per_file)
         if blob is None:
@@ -334,10 +445,11 @@ async def merge(
     seal = store.get_seal()
     _no_store_cache_headers(response, etag=_etag_from_seal(seal))
 
+    # Trusted internal values: skip validation (it would copy `urls` element-wise)
     if mode == "urls":
-        return ExhaleResponse(status="ok", mode="urls", urls=store.exhale_urls(), state=None)
+        return ExhaleResponse.model_construct(status="ok", mode="urls", urls=store.exhale_urls(), state=None)
 
-    return ExhaleResponse(status="ok", mode="state", urls=None, state=store.get_state())
+    return ExhaleResponse.model_construct(status="ok", mode="state", urls=None, state=store.get_state())
 
 @router.get(
     "/state",
@@ -345,8 +457,11 @@ async def merge(
     response_model=SigilState,
     responses={304: {"description": "Not Modified"}},
 )
-def state(request: Request, response: Response) -> SigilState | Response:
-    store = get_store()
+def state(
+    request: Request,
+    response: Response,
+    store: SigilStateStore = Depends(_request_store),
+) -> SigilState | Response:
     s = _store_seal(store)
     etag = _etag_from_seal(s)
 
@@ -369,8 +484,8 @@ def urls(
     response: Response,
     offset: int = Query(0, ge=0),
     limit: int = Query(10_000, ge=1, le=200_000),
+    store: SigilStateStore = Depends(_request_store),
 ) -> UrlsPageResponse | Response:
-    store = get_store()
     s = _store_seal(store)
     etag = _etag_from_seal(s)
 
@@ -381,7 +496,9 @@ def urls(
     _no_store_cache_headers(response, etag=etag)
 
     page, total = _store_urls_page(store, offset=int(offset), limit=int(limit))
-    return UrlsPageResponse(
+    # page is a fresh slice of the cached Kai-ordered list: hand it over as-is
+    return UrlsPageResponse.model_construct(
+        status="ok",
         state_seal=s,
         total=int(total),
         offset=int(offset),
@@ -400,8 +517,8 @@ def exhale(
     request: Request,
     response: Response,
     mode: Literal["urls", "state"] = Query("urls"),
+    store: SigilStateStore = Depends(_request_store),
 ) -> ExhaleResponse | Response:
-    store = get_store()
     s = _store_seal(store)
     etag = _etag_from_seal(s)
 
@@ -411,7 +528,8 @@ def exhale(
 
     _no_store_cache_headers(response, etag=etag)
 
+    # Trusted internal values: skip validation (it would copy `urls` element-wise)
     if mode == "urls":
-        return ExhaleResponse(status="ok", mode="urls", urls=store.exhale_urls(), state=None)
+        return ExhaleResponse.model_construct(status="ok", mode="urls", urls=store.exhale_urls(), state=None)
 
-    return ExhaleResponse(status="ok", mode="state", urls=None, state=store.get_state())
+    return ExhaleResponse.model_construct(status="ok", mode="state", urls=None, state=store.get_state())
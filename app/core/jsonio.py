@@ -2,16 +2,78 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+import math
+import mmap
+import threading
+from typing import Any, Union
 
+# Optional fast paths (pure-stdlib fallback when unavailable)
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
-def loads_json_bytes(blob: bytes, *, name: str = "krystal.json") -> Any:
+try:
+    import simdjson
+except ImportError:
+    simdjson = None  # type: ignore[assignment]
+
+
+# Anything exposing the buffer protocol we accept as a JSON document
+# (uploads are handed over as zero-copy views / read-only file maps).
+JsonBlob = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+# simdjson parsers are expensive to build (internal buffers) and NOT thread-safe:
+# keep one alive per thread (requests may parse concurrently on server worker threads).
+_TLS = threading.local()
+
+
+def _simd_parser() -> Any:
+    parser = getattr(_TLS, "simd_parser", None)
+    if parser is None:
+        parser = simdjson.Parser()
+        _TLS.simd_parser = parser
+    return parser
+
+
+def _fast_loads(blob: JsonBlob) -> Any:
     """
-    Parse JSON bytes with strict UTF-8 decode.
+    SIMD/C-speed parse. Raises on ANY problem; caller falls back to stdlib
+    (which produces the crisp error message and accepts stdlib-only extensions
+    like NaN / big ints).
+    """
+    if simdjson is not None:
+        doc = _simd_parser().parse(blob)
+        if isinstance(doc, simdjson.Object):
+            return doc.as_dict()
+        if isinstance(doc, simdjson.Array):
+            return doc.as_list()
+        return doc
+    if orjson is not None:
+        if isinstance(blob, (bytes, bytearray, memoryview)):
+            return orjson.loads(blob)
+        with memoryview(blob) as view:
+            return orjson.loads(view)
+    raise RuntimeError("no fast JSON parser available")
+
+
+def loads_json_bytes(blob: JsonBlob, *, name: str = "krystal.json") -> Any:
+    """
+    Parse JSON bytes (or any buffer: bytearray/memoryview/mmap) with strict UTF-8 decode.
     Raises ValueError with a crisp message (we surface these in inhale errors).
+
+    Fast path: simdjson (or orjson) straight from the buffer (no copy).
+    Slow path: stdlib json (identical results + error messages).
     """
+    if simdjson is not None or orjson is not None:
+        try:
+            return _fast_loads(blob)
+        except Exception:
+            pass
+
     try:
-        text = blob.decode("utf-8")
+        text = str(blob, "utf-8")
     except UnicodeDecodeError as e:
         raise ValueError(f"{name}: not valid UTF-8 ({e})") from e
 
@@ -21,20 +83,53 @@ def loads_json_bytes(blob: bytes, *, name: str = "krystal.json") -> Any:
         raise ValueError(f"{name}: invalid JSON ({e.msg} at line {e.lineno} col {e.colno})") from e
 
 
-def dumps_canonical_json(obj: Any) -> str:
+def _has_non_finite(obj: Any) -> bool:
+    """True if any float in the JSON tree is NaN/±Infinity (orjson would write null)."""
+    if isinstance(obj, dict):
+        stack = list(obj.values())
+    elif isinstance(obj, (list, tuple)):
+        stack = list(obj)
+    else:
+        stack = [obj]
+    while stack:
+        v = stack.pop()
+        t = type(v)
+        if t is str or t is int or v is None or t is bool:
+            continue
+        if isinstance(v, float):
+            if not math.isfinite(v):
+                return True
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+    return False
+
+
+def dumps_canonical_json(obj: Any) -> bytes:
     """
-    Determinate JSON dump:
+    Determinate JSON dump (UTF-8 bytes):
     - sorted keys
     - no trailing spaces
     - stable separators
-    - UTF-8 safe (ensure_ascii=False)
+    - UTF-8 safe (no ASCII escaping)
+
+    orjson when available (bytes out, no str→bytes re-encode); stdlib otherwise,
+    when orjson refuses the input (e.g. non-str keys, >64-bit ints), or when a
+    float is non-finite (orjson writes null; stdlib keeps NaN/Infinity).
     """
+    if orjson is not None and not _has_non_finite(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+
     return json.dumps(
         obj,
         ensure_ascii=False,
         sort_keys=True,
         separators=(",", ":"),
-    )
+    ).encode("utf-8")
 
 
 def dumps_pretty_json(obj: Any) -> str:
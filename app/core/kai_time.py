@@ -47,6 +47,21 @@ def _safe_int(v: object) -> int:
     return 0
 
 
+def kai_key(p: SigilPayloadLoose) -> tuple[int, int, int]:
+    """
+    Plain (pulse, beat, stepIndex) tuple — the merge/ordering comparator key.
+    Same values as kai_tuple_from_payload(p).as_tuple(), without building a
+    KaiTuple: validated payloads already hold exact ints, so the common case is
+    three attribute loads and a tuple (_safe_int coercion only runs otherwise).
+    """
+    pulse = getattr(p, "pulse", None)
+    beat = getattr(p, "beat", None)
+    step = getattr(p, "stepIndex", None)
+    if type(pulse) is int and type(beat) is int and type(step) is int:
+        return (pulse, beat, step)
+    return (_safe_int(pulse), _safe_int(beat), _safe_int(step))
+
+
 def kai_tuple_from_payload(p: SigilPayloadLoose) -> KaiTuple:
     """
     Derive KaiTuple from payload fields ONLY (no Chronos).
@@ -55,21 +70,17 @@ def kai_tuple_from_payload(p: SigilPayloadLoose) -> KaiTuple:
     Note: We do NOT clamp pulse/beat/stepIndex here; negative values are allowed
     but will naturally sort earlier than positive values.
     """
-    # Prefer model fields (already normalized), but keep this robust.
-    pulse = _safe_int(getattr(p, "pulse", None))
-    beat = _safe_int(getattr(p, "beat", None))
-    step = _safe_int(getattr(p, "stepIndex", None))
-    return KaiTuple(pulse=pulse, beat=beat, stepIndex=step)
+    return KaiTuple(*kai_key(p))
 
 
 def kai_newer(a: SigilPayloadLoose, b: SigilPayloadLoose) -> bool:
     """True if a is strictly newer than b by Kai ordering."""
-    return kai_tuple_from_payload(a).as_tuple() > kai_tuple_from_payload(b).as_tuple()
+    return kai_key(a) > kai_key(b)
 
 
 def kai_equal(a: SigilPayloadLoose, b: SigilPayloadLoose) -> bool:
     """True if a and b share the same Kai tuple."""
-    return kai_tuple_from_payload(a).as_tuple() == kai_tuple_from_payload(b).as_tuple()
+    return kai_key(a) == kai_key(b)
 
 
 def kai_sort_key_desc(p: SigilPayloadLoose) -> tuple[int, int, int]:
@@ -78,7 +89,28 @@ def kai_sort_key_desc(p: SigilPayloadLoose) -> tuple[int, int, int]:
     Python sorts ascending by default, so callers should pass reverse=True
     OR use negative key. We keep it explicit: return the natural tuple and reverse=True.
     """
-    return kai_tuple_from_payload(p).as_tuple()
+    return kai_key(p)
+
+
+# Packed sort key layout: pulse << 64 | (beat + bias) << 32 | (stepIndex + bias)
+_KAI_PACK_BIAS = 1 << 31
+_KAI_PACK_FIELD = 1 << 32
+
+
+def kai_sort_int(p: SigilPayloadLoose) -> int | None:
+    """
+    Kai tuple packed into ONE int with the exact same ordering as the tuple
+    (single int compare instead of a 3-element tuple compare per sort step).
+
+    Any pulse packs (it occupies the high bits). beat/stepIndex must fit a
+    biased 32-bit field; returns None otherwise — callers fall back to tuples.
+    """
+    pulse, beat, step = kai_key(p)
+    b = beat + _KAI_PACK_BIAS
+    s = step + _KAI_PACK_BIAS
+    if not (0 <= b < _KAI_PACK_FIELD and 0 <= s < _KAI_PACK_FIELD):
+        return None
+    return (pulse << 64) | (b << 32) | s
 
 
 T = TypeVar("T")
@@ -99,9 +131,6 @@ def sort_by_kai_desc(
 
 def latest_kai(items: Iterable[SigilPayloadLoose]) -> KaiTuple:
     """Return the latest KaiTuple across items; returns (0,0,0) if empty."""
-    latest = KaiTuple(0, 0, 0)
-    for p in items:
-        kt = kai_tuple_from_payload(p)
-        if kt.as_tuple() > latest.as_tuple():
-            latest = kt
-    return latest
+    best = max(map(kai_key, items), default=(0, 0, 0))
+    # (0,0,0) floor: all-negative registries still report (0,0,0)
+    return KaiTuple(*best) if best > (0, 0, 0) else KaiTuple(0, 0, 0)
@@ -1,11 +1,13 @@
 # app/core/merge_engine.py
 from __future__ import annotations
 
+import weakref
+from collections.abc import Iterator, Mapping, MutableMapping
 from dataclasses import dataclass
 from typing import Any
 
-from app.core.jsonio import loads_json_bytes
-from app.core.kai_time import kai_tuple_from_payload, kai_newer, kai_sort_key_desc
+from app.core.jsonio import JsonBlob, loads_json_bytes
+from app.core.kai_time import kai_key, kai_newer, kai_sort_key_desc
 from app.core.url_extract import (
     canonicalize_url,
     extract_many_payloads_from_any,
@@ -14,7 +16,7 @@ from app.core.url_extract import (
 from app.core.witness import (
     derive_witness_context,
     merge_derived_context,
-    synthesize_edges_from_witness_chain,
+    synthesize_edges_from_canonical_chain,
 )
 from app.models.payload import SigilPayloadLoose
 from app.models.state import InhaleReport
@@ -32,14 +34,13 @@ def _is_missing(v: object) -> bool:
     return False
 
 
-def _richness_score(p: SigilPayloadLoose) -> int:
+def _richness_score(d: dict[str, Any]) -> int:
     """
-    Determinate payload richness score:
+    Determinate payload richness score (over a payload dump):
     - counts non-missing fields (including extras)
     - weights topology + identity slightly higher
     Used only for tie-breaks when Kai-time is equal.
     """
-    d = p.model_dump(exclude_none=False)
     score = 0
     for k, v in d.items():
         if _is_missing(v):
@@ -57,53 +58,82 @@ def _canonicalize_topology(p: SigilPayloadLoose, *, base_origin: str) -> SigilPa
     Canonicalize originUrl/parentUrl (if present) to stable absolute URL keys.
     Mirrors the frontend behavior: relative → absolute, tokens → /stream/p/<token>.
     """
-    changed = False
-    next_p = p
+    update: dict[str, str] = {}
 
     if isinstance(p.originUrl, str) and p.originUrl.strip():
         o = canonicalize_url(p.originUrl, base_origin=base_origin)
         if o and o != p.originUrl:
-            next_p = SigilPayloadLoose.model_validate(next_p.model_dump())
-            next_p.originUrl = o
-            changed = True
+            update["originUrl"] = o
 
     if isinstance(p.parentUrl, str) and p.parentUrl.strip():
         pr = canonicalize_url(p.parentUrl, base_origin=base_origin)
         if pr and pr != p.parentUrl:
-            if not changed:
-                next_p = SigilPayloadLoose.model_validate(next_p.model_dump())
-            next_p.parentUrl = pr
+            update["parentUrl"] = pr
+
+    # shallow copy with the canonical fields (no dump → validate round-trip)
+    return p.model_copy(update=update) if update else p
+
 
-    return next_p
+# id(payload) → (weakref to it, its model_dump). Registry payloads are never
+# mutated once stored, so a dump stays valid for the payload's lifetime and
+# the weakref callback evicts it with the payload. Keyed by identity rather than
+# a WeakKeyDictionary: frozen models hash and compare by field values, so every
+# lookup would hash the fields and every hit run a full __eq__, and equal payloads
+# would share one slot that dies with whichever instance created it.
+# Callers must treat memoized dumps as read-only.
+_DUMPS: dict[int, tuple[weakref.ref[SigilPayloadLoose], dict[str, Any]]] = {}
 
 
-def _merge_payload(prev: SigilPayloadLoose, inc: SigilPayloadLoose) -> SigilPayloadLoose:
+def _remember_dump(p: SigilPayloadLoose, d: dict[str, Any]) -> None:
+    key = id(p)
+    _DUMPS[key] = (weakref.ref(p, lambda _r, key=key: _DUMPS.pop(key, None)), d)
+
+
+def _payload_dump(p: SigilPayloadLoose) -> dict[str, Any]:
+    """p.model_dump(exclude_none=False), memoized per payload instance."""
+    hit = _DUMPS.get(id(p))
+    if hit is not None and hit[0]() is p:
+        return hit[1]
+    d = p.model_dump(exclude_none=False)
+    _remember_dump(p, d)
+    return d
+
+
+def memoized_payload_dump(p: SigilPayloadLoose) -> dict[str, Any] | None:
+    """The memoized dump of `p`, if an upsert left one (lookup only; read-only dict)."""
+    hit = _DUMPS.get(id(p))
+    if hit is not None and hit[0]() is p:
+        return hit[1]
+    return None
+
+
+def _merge_payload_dumps(
+    prev: SigilPayloadLoose,
+    prev_d: dict[str, Any],
+    inc: SigilPayloadLoose,
+) -> dict[str, Any]:
     """
-    Determinate merge:
+    Determinate merge, on dumps (each payload is dumped exactly once):
     1) Prefer newer payload by Kai tuple (pulse, beat, stepIndex).
     2) If equal Kai tuple, prefer richer payload.
     3) Fill missing fields from the other payload (never overwrite existing non-missing).
+
+    Returns the merged dump (a new dict; `prev_d` is left untouched).
     """
-    prev_k = kai_tuple_from_payload(prev).as_tuple()
-    inc_k = kai_tuple_from_payload(inc).as_tuple()
+    prev_k = kai_key(prev)
+    inc_k = kai_key(inc)
+    inc_d = inc.model_dump(exclude_none=False)
 
     if inc_k > prev_k:
-        base = inc
-        other = prev
+        bd, od = inc_d, prev_d
     elif inc_k < prev_k:
-        base = prev
-        other = inc
+        bd, od = dict(prev_d), inc_d
     else:
         # tie: choose richer as base
-        if _richness_score(inc) > _richness_score(prev):
-            base = inc
-            other = prev
+        if _richness_score(inc_d) > _richness_score(prev_d):
+            bd, od = inc_d, prev_d
         else:
-            base = prev
-            other = inc
-
-    bd = base.model_dump(exclude_none=False)
-    od = other.model_dump(exclude_none=False)
+            bd, od = dict(prev_d), inc_d
 
     # Fill missing keys only
     for k, ov in od.items():
@@ -111,11 +141,11 @@ def _merge_payload(prev: SigilPayloadLoose, inc: SigilPayloadLoose) -> SigilPayl
         if _is_missing(bv) and not _is_missing(ov):
             bd[k] = ov
 
-    return SigilPayloadLoose.model_validate(bd)
+    return bd
 
 
 def _ensure_url_in_registry(
-    reg: dict[str, SigilPayloadLoose],
+    reg: MutableMapping[str, SigilPayloadLoose],
     url: str,
     *,
     base_origin: str,
@@ -134,7 +164,7 @@ def _ensure_url_in_registry(
 
 
 def _stitch_explicit_parent_chain(
-    reg: dict[str, SigilPayloadLoose],
+    reg: MutableMapping[str, SigilPayloadLoose],
     start_url: str,
     *,
     base_origin: str,
@@ -182,7 +212,7 @@ def _stitch_explicit_parent_chain(
 
 
 def upsert_payload(
-    reg: dict[str, SigilPayloadLoose],
+    reg: MutableMapping[str, SigilPayloadLoose],
     url_key: str,
     payload: SigilPayloadLoose,
 ) -> bool:
@@ -195,81 +225,170 @@ def upsert_payload(
         reg[url_key] = payload
         return True
 
-    merged = _merge_payload(prev, payload)
-
-    # Detect material change (topology + Kai tuple + signature changes)
-    prev_d = prev.model_dump(exclude_none=False)
-    merged_d = merged.model_dump(exclude_none=False)
+    prev_d = _payload_dump(prev)
+    merged_d = _merge_payload_dumps(prev, prev_d, payload)
 
+    # Detect material change (topology + Kai tuple + signature changes).
+    # Dumps carry every declared field, so validating merged_d round-trips to
+    # exactly merged_d: comparing before validation is equivalent, and an
+    # idempotent re-inhale never builds a model at all.
     if prev_d == merged_d:
         return False
 
+    merged = SigilPayloadLoose.model_validate(merged_d)
+    _remember_dump(merged, merged_d)  # exact round-trip (see above): next upsert skips its dump
     reg[url_key] = merged
     return True
 
 
-def inhale_files_into_registry(
+class _RecordingRegistry(MutableMapping[str, SigilPayloadLoose]):
+    """
+    Write-through view over a registry that records every key written.
+    Lets the merge stage report exactly which URLs it touched (callers keep
+    incremental indexes — latest Kai, order, persistence — in O(changed)).
+    """
+
+    __slots__ = ("_reg", "written")
+
+    def __init__(self, reg: MutableMapping[str, SigilPayloadLoose]) -> None:
+        self._reg = reg
+        self.written: set[str] = set()
+
+    def __getitem__(self, key: str) -> SigilPayloadLoose:
+        return self._reg[key]
+
+    def __setitem__(self, key: str, value: SigilPayloadLoose) -> None:
+        self._reg[key] = value
+        self.written.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._reg[key]
+        self.written.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._reg
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._reg)
+
+    def __len__(self) -> int:
+        return len(self._reg)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._reg.get(key, default)
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedHit:
+    """
+    One payload hit, fully prepared for merge (registry-independent work done):
+    - url_key: canonical absolute URL key
+    - payload: payload with derived witness context + canonical topology
+    - chain: witness chain (origin..parent) carried by the URL
+    """
+    url_key: str
+    payload: SigilPayloadLoose
+    chain: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedKrystal:
+    """
+    Parse-stage result for one uploaded file.
+    - hits_total: all decodable payload hits found (even if not mergeable)
+    - error: parse failure message (file contributes nothing)
+    """
+    name: str
+    hits_total: int = 0
+    hits: tuple[PreparedHit, ...] = ()
+    error: str | None = None
+
+
+def _parse_one_file(name: str, blob: JsonBlob, *, base_origin: str) -> ParsedKrystal:
+    try:
+        obj = loads_json_bytes(blob, name=name)
+    except Exception as e:
+        return ParsedKrystal(name=name, error=str(e))
+
+    # Extract all decodable payload hits embedded anywhere in the JSON
+    hits = extract_many_payloads_from_any(obj, base_origin=base_origin)
+
+    prepared: list[PreparedHit] = []
+    for hit in hits:
+        url_key = canonicalize_url(hit.url_key, base_origin=base_origin)
+        if not url_key:
+            continue
+
+        # Derive witness context from the URL itself (query + hash add=)
+        ctx = derive_witness_context(url_key, base_origin=base_origin)
+        merged_leaf = merge_derived_context(hit.payload, ctx)
+        merged_leaf = _canonicalize_topology(merged_leaf, base_origin=base_origin)
+        prepared.append(PreparedHit(url_key=url_key, payload=merged_leaf, chain=ctx.chain))
+
+    return ParsedKrystal(name=name, hits_total=len(hits), hits=tuple(prepared))
+
+
+def parse_krystal_files(
+    files: list[tuple[str, JsonBlob]],
+    *,
+    base_origin: str,
+) -> list[ParsedKrystal]:
+    """
+    Parse stage (pure — never touches a registry, safe to run without store locks).
+
+    Files are parsed in order on the calling thread: payload decode and URL
+    canonicalization are GIL-bound Python, so a thread pool would only add
+    thread startup per request.
+    """
+    return [_parse_one_file(name, blob, base_origin=base_origin) for (name, blob) in files]
+
+
+def merge_parsed_into_registry(
     reg: dict[str, SigilPayloadLoose],
-    files: list[tuple[str, bytes]],
+    parsed: list[ParsedKrystal],
     *,
     base_origin: str,
 ) -> InhaleReport:
     """
-    Core breath-merge engine.
+    Merge stage: apply parse-stage results to `reg` (mutates in place).
+    Callers that share `reg` across threads must hold their write lock here.
 
-    Input: one or more JSON files (krystals).
-    Output: InhaleReport; mutates `reg` in place.
-
-    Determinism & Rules:
-    - No Chronos time is used (ever).
-    - Ordering and "newer wins" is Kai tuple (pulse, beat, stepIndex).
-    - Witness chain (#add= / ?add=) is used to derive and synthesize topology.
-    - Explicit payload fields are never overwritten by derived context.
+    report.changed lists every URL key written (inserted or replaced).
     """
     report = InhaleReport()
     registry_changes = 0
+    rec = _RecordingRegistry(reg)
 
-    for name, blob in files:
-        try:
-            obj = loads_json_bytes(blob, name=name)
-        except Exception as e:
+    for pk in parsed:
+        if pk.error is not None:
             report.crystals_failed += 1
-            report.errors.append(str(e))
+            report.errors.append(pk.error)
             continue
 
-        # Extract all decodable payload hits embedded anywhere in the JSON
-        hits = extract_many_payloads_from_any(obj, base_origin=base_origin)
-
-        report.crystals_total += len(hits)
+        report.crystals_total += pk.hits_total
 
         # Process each hit
-        for hit in hits:
-            url_key = canonicalize_url(hit.url_key, base_origin=base_origin)
-            if not url_key:
-                continue
-
-            # Derive witness context from the URL itself (query + hash add=)
-            ctx = derive_witness_context(url_key, base_origin=base_origin)
-            merged_leaf = merge_derived_context(hit.payload, ctx)
-            merged_leaf = _canonicalize_topology(merged_leaf, base_origin=base_origin)
+        for hit in pk.hits:
+            url_key = hit.url_key
 
-            changed = upsert_payload(reg, url_key, merged_leaf)
+            changed = upsert_payload(rec, url_key, hit.payload)
             if changed:
                 registry_changes += 1
                 report.crystals_imported += 1
 
-            # If witness chain exists, synthesize edges across chain + leaf (soft fill)
-            if ctx.chain:
-                registry_changes += synthesize_edges_from_witness_chain(
-                    ctx.chain,
+            # If witness chain exists, synthesize edges across chain + leaf (soft fill).
+            # Both are canonical already (extract_witness_chain_from_url / parse stage).
+            if hit.chain:
+                registry_changes += synthesize_edges_from_canonical_chain(
+                    hit.chain,
                     url_key,
-                    reg,
+                    rec,
                     base_origin=base_origin,
                 )
 
             # Fallback ancestry from explicit parent/origin fields
             registry_changes += _stitch_explicit_parent_chain(
-                reg,
+                rec,
                 url_key,
                 base_origin=base_origin,
                 max_depth=128,
@@ -278,18 +397,40 @@ def inhale_files_into_registry(
     report.registry_urls = len(reg)
 
     # Compute latest pulse across registry (Kai-only)
-    latest_pulse: int | None = None
-    for p in reg.values():
-        if p.pulse is None:
-            continue
-        if latest_pulse is None or int(p.pulse) > latest_pulse:
-            latest_pulse = int(p.pulse)
-    report.latest_pulse = latest_pulse
+    pulses = [p.pulse for p in reg.values() if p.pulse is not None]
+    report.latest_pulse = int(max(pulses)) if pulses else None
+    report.changed = rec.written
 
     return report
 
 
-def build_ordered_urls(reg: dict[str, SigilPayloadLoose]) -> list[str]:
+def inhale_files_into_registry(
+    reg: dict[str, SigilPayloadLoose],
+    files: list[tuple[str, JsonBlob]],
+    *,
+    base_origin: str,
+) -> InhaleReport:
+    """
+    Core breath-merge engine.
+
+    Input: one or more JSON files (krystals).
+    Output: InhaleReport; mutates `reg` in place.
+
+    Two stages:
+    1) parse_krystal_files: JSON parse + payload decode (sequential, registry-free)
+    2) merge_parsed_into_registry: Determinate registry merge (sequential)
+
+    Determinism & Rules:
+    - No Chronos time is used (ever).
+    - Ordering and "newer wins" is Kai tuple (pulse, beat, stepIndex).
+    - Witness chain (#add= / ?add=) is used to derive and synthesize topology.
+    - Explicit payload fields are never overwritten by derived context.
+    """
+    parsed = parse_krystal_files(files, base_origin=base_origin)
+    return merge_parsed_into_registry(reg, parsed, base_origin=base_origin)
+
+
+def build_ordered_urls(reg: Mapping[str, SigilPayloadLoose]) -> list[str]:
     """
     Determinate SigilExplorer export:
     - Returns canonical URL keys sorted by Kai time DESC, tie-broken by URL string ASC.
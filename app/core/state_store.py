@@ -1,18 +1,37 @@
 # app/core/state_store.py
 from __future__ import annotations
 
-import hashlib
+import atexit
+import logging
+import mmap
 import os
+import queue
+import shutil
 import threading
+import time
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-from app.core.jsonio import dumps_canonical_json, loads_json_bytes
-from app.core.kai_time import latest_kai
-from app.core.merge_engine import build_ordered_urls, inhale_files_into_registry
+import blake3
+from pydantic import ValidationError
+from sortedcontainers import SortedList
+
+from app.core.jsonio import JsonBlob, dumps_canonical_json, loads_json_bytes
+from app.core.kai_time import KaiTuple, kai_key, kai_sort_int, latest_kai
+from app.core.merge_engine import (
+    build_ordered_urls,
+    memoized_payload_dump,
+    merge_parsed_into_registry,
+    parse_krystal_files,
+)
 from app.models.payload import SigilPayloadLoose
-from app.models.state import InhaleReport, KaiMoment, SigilEntry, SigilState
+from app.models.state import InhaleReport, KaiMoment, RegistryModel, SigilEntry, SigilState
+
+_log = logging.getLogger(__name__)
 
 
 def _default_base_origin() -> str:
@@ -35,45 +54,316 @@ def _safe_int(name: str, default: int) -> int:
         return default
 
 
-def _atomic_write_text(path: Path, text: str, *, keep_backup: bool = True) -> None:
+def _atomic_write_bytes(path: Path, data: bytes, *, keep_backup: bool = True) -> None:
     """
     Atomic write with optional backup.
     - Writes to <path>.tmp, fsyncs, then os.replace() into place.
     - If keep_backup and target exists, we save <path>.bak as last-known-good.
     """
+    _atomic_write_chunks(path, (data,), keep_backup=keep_backup)
+
+
+_WRITE_BATCH_BYTES = 1 << 20
+
+
+def _atomic_write_chunks(path: Path, chunks: Iterable[bytes], *, keep_backup: bool = True) -> None:
+    """_atomic_write_bytes for a document streamed as byte chunks (never joined in memory)."""
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
     bak = path.with_suffix(path.suffix + ".bak")
 
-    with tmp.open("w", encoding="utf-8") as f:
-        f.write(text)
-        f.flush()
-        os.fsync(f.fileno())
+    # raw fd; small chunks (one per registry entry) are coalesced into ~1 MiB
+    # batches so a snapshot costs O(size / 1 MiB) syscalls, not one per URL
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        batch = bytearray()
+        for chunk in chunks:
+            batch += chunk
+            if len(batch) >= _WRITE_BATCH_BYTES:
+                _write_all(fd, batch)
+                batch.clear()
+        if batch:
+            _write_all(fd, batch)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
     if keep_backup and path.exists():
-        try:
-            bak.write_bytes(path.read_bytes())
-        except Exception:
-            pass
+        _backup_best_effort(path, bak)
 
     os.replace(tmp, path)
 
 
+def _write_all(fd: int, data: bytes | bytearray) -> None:
+    """os.write until done (it may write short, e.g. on signals or huge buffers)."""
+    with memoryview(data) as view:
+        while view:
+            n = os.write(fd, view)
+            view = view[n:]
+
+
+def _backup_best_effort(path: Path, bak: Path) -> None:
+    """
+    Keep the current file as <path>.bak WITHOUT copying through userspace:
+    - hardlink (zero bytes copied; must happen BEFORE the replace so it pins the old inode)
+    - fallback: shutil.copyfile (in-kernel sendfile/copy_file_range where available)
+    """
+    try:
+        bak.unlink(missing_ok=True)
+        os.link(path, bak)
+        return
+    except OSError:
+        pass
+    try:
+        shutil.copyfile(path, bak)
+    except Exception:
+        pass
+
+
+def _append_bytes_durable(path: Path, data: bytes) -> None:
+    """
+    Append + fsync (ops log writes).
+    A failed append (e.g. ENOSPC after a partial write) is cut back off, so the
+    next append never lands on the tail of a torn record.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        start = os.fstat(fd).st_size
+        try:
+            _write_all(fd, data)
+            os.fsync(fd)
+        except BaseException:
+            try:
+                os.ftruncate(fd, start)
+            except OSError:
+                pass
+            raise
+    finally:
+        os.close(fd)
+
+
+def _log_header(gen: int) -> bytes:
+    return dumps_canonical_json({"spec": "KKS-1.0", "log_gen": gen}) + b"\n"
+
+
+def _payload_json_bytes(p: SigilPayloadLoose) -> bytes:
+    """
+    Canonical (sorted-key) payload JSON; memoized per URL, so it runs once per new payload.
+    Payload values are JSON-native already (parsed from JSON): the python-mode
+    dump goes straight to orjson, reusing the dump the merge left when there is one.
+    """
+    d = memoized_payload_dump(p)
+    if d is None:
+        d = p.model_dump()
+    return dumps_canonical_json(d)
+
+
+def _log_line(url: str, payload_json: bytes | None) -> bytes:
+    """One ops-log record: upsert (p=payload JSON) or removal (p=null)."""
+    p = payload_json if payload_json is not None else b"null"
+    return b'{"u":' + dumps_canonical_json(url) + b',"p":' + p + b"}\n"
+
+
+def _snapshot_chunks(gen: int, items: Iterable[tuple[str, bytes]]) -> list[bytes]:
+    """
+    Snapshot document as byte chunks, one per (url, payload JSON) entry:
+    no intermediate dict tree of the whole registry is ever built.
+    Top-level keys are written in sorted order (log_gen, registry, spec): fed
+    URL-sorted canonical entries, the bytes equal dumps_canonical_json(document).
+    """
+    chunks = [b'{"log_gen":' + dumps_canonical_json(gen) + b',"registry":{']
+    sep = b""
+    for (u, pj) in items:
+        chunks.append(sep + dumps_canonical_json(u) + b":" + pj)
+        sep = b","
+    chunks.append(b'},"spec":' + dumps_canonical_json("KKS-1.0") + b"}")
+    return chunks
+
+
+def _read_log_best_effort(path: Path) -> tuple[int | None, list[dict[str, Any]], int]:
+    """
+    Returns (log_gen, records, clean_size). A missing/headerless log yields (None, [], 0).
+    Undecodable lines are skipped, and so is an unterminated final line (a torn
+    append); clean_size is the length up to the last "\n" (< file size when torn).
+
+    The log is memory-mapped and each record parsed straight from its byte
+    range (no whole-file bytes copy, no per-line split copies).
+    """
+    name = str(path)
+    try:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _parse_log_lines(mm, view, name=name)
+    except Exception:
+        return (None, [], 0)
+
+
+def _parse_log_lines(
+    mm: mmap.mmap,
+    view: memoryview,
+    *,
+    name: str,
+) -> tuple[int | None, list[dict[str, Any]], int]:
+    size = len(mm)
+    end = mm.find(b"\n")
+    if end < 0:
+        end = size
+    try:
+        with view[:end] as line:
+            header = loads_json_bytes(line, name=name)
+    except Exception:
+        return (None, [], 0)
+    gen = header.get("log_gen") if isinstance(header, dict) else None
+    if not isinstance(gen, int):
+        return (None, [], 0)
+
+    records: list[dict[str, Any]] = []
+    start = end + 1
+    while start < size:
+        end = mm.find(b"\n", start)
+        if end < 0:
+            # unterminated tail: torn by definition (even if it happens to parse),
+            # and it lies past clean_size, so the load truncates it off disk
+            break
+        if end > start:
+            # blank/undecodable lines are skipped
+            try:
+                with view[start:end] as line:
+                    rec = loads_json_bytes(line, name=name)
+            except Exception:
+                rec = None
+            if isinstance(rec, dict) and isinstance(rec.get("u"), str):
+                records.append(rec)
+        start = end + 1
+    return (gen, records, mm.rfind(b"\n") + 1)
+
+
+def _payload_from_disk(obj: dict[str, Any], *, trusted: bool) -> SigilPayloadLoose:
+    """
+    Trusted (written by this service under the current spec): the dict is an
+    already-normalized model dump — construct without re-validating.
+    Otherwise (foreign/older spec): full validation for migration.
+    """
+    if trusted:
+        return SigilPayloadLoose.model_construct(**obj)
+    return SigilPayloadLoose.model_validate(obj)
+
+
+def _registry_from_disk(reg: dict[str, Any], *, trusted: bool) -> dict[str, SigilPayloadLoose]:
+    """
+    Snapshot registry → payloads. Trusted entries are constructed directly.
+    Foreign/older spec: validate the whole registry in one pydantic-core pass
+    (RegistryModel); only if some entry is invalid, fall back to per-entry
+    validation so a bad entry can't drop the rest.
+    """
+    if not trusted:
+        try:
+            validated = RegistryModel.model_validate(reg).root
+        except ValidationError:
+            pass
+        else:
+            return {url: p for (url, p) in validated.items() if url.strip()}
+
+    out: dict[str, SigilPayloadLoose] = {}
+    for url, payload_obj in reg.items():
+        if not isinstance(url, str) or not url.strip():
+            continue
+        if not isinstance(payload_obj, dict):
+            continue
+        try:
+            out[url] = _payload_from_disk(payload_obj, trusted=trusted)
+        except Exception:
+            continue
+    return out
+
+
 def _load_json_file_best_effort(path: Path) -> dict[str, Any] | None:
+    """
+    Parse a snapshot straight from a read-only file map: the parser reads the
+    page cache in place (no second full-size bytes copy during startup).
+    Parsed objects own their data, so the map is closed before returning.
+    """
     try:
-        blob = path.read_bytes()
-        obj = loads_json_bytes(blob, name=str(path))
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            obj = loads_json_bytes(mm, name=str(path))
         return obj if isinstance(obj, dict) else None
     except Exception:
         return None
 
 
+# URLs hashed per update() call: bounds the temporary join while amortizing
+# per-call overhead (one C call per batch instead of two per URL).
+_SEAL_BATCH = 1024
+
+
 def _compute_seal_from_urls(urls: list[str]) -> str:
     """
     Determinate seal for cache/ETag-like behavior (NOT a security boundary).
+
+    Hashes the raw Kai-ordered URL bytes, each terminated by NUL — no JSON
+    materialization. Canonical URL keys never contain NUL, so the framing is
+    injective. (Batching is invisible: the hashed byte stream is identical.)
+
+    BLAKE3 (SIMD), 128-bit. A hard dependency on purpose: the seal must be
+    identical across nodes holding the same registry, so there is no fallback.
     """
-    blob = dumps_canonical_json({"urls": urls}).encode("utf-8")
-    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+    h = blake3.blake3()
+    for i in range(0, len(urls), _SEAL_BATCH):
+        h.update("\x00".join(urls[i : i + _SEAL_BATCH]).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest(length=16)
+
+
+def _build_state(
+    urls: list[str],
+    registry: Mapping[str, SigilPayloadLoose],
+    seal: str,
+    latest_kai_tuple: KaiTuple,
+) -> SigilState:
+    """
+    SigilState for one registry version. Ordered URLs are exactly the registry
+    keys, and url/payload are already validated: one pass, no re-checks.
+    """
+    entries = [SigilEntry.model_construct(url=url, payload=registry[url]) for url in urls]
+
+    if entries:
+        lt = latest_kai_tuple
+        latest = KaiMoment.model_construct(pulse=int(lt.pulse), beat=int(lt.beat), stepIndex=int(lt.stepIndex))
+    else:
+        latest = KaiMoment()
+
+    # Trusted internal values: skip validation (it would rebuild both N-lists)
+    return SigilState.model_construct(
+        spec="KKS-1.0",
+        total_urls=len(entries),
+        latest=latest,
+        state_seal=seal,
+        registry=entries,
+        urls=urls,
+    )
+
+
+# (sort_key, url) index entry → url, as a C-level getter (no per-entry tuple unpack)
+_index_url = itemgetter(1)
+
+
+@dataclass(slots=True)
+class _RegistryView:
+    """
+    One published registry version (the RCU unit). Never mutated after publish,
+    except for filling its own lazily built caches (seal/state) exactly once.
+    """
+
+    version: int
+    registry: Mapping[str, SigilPayloadLoose]  # read-only proxy over a private dict
+    urls: list[str]  # Kai-desc export order
+    latest: KaiTuple
+    seal: str | None = None
+    state: SigilState | None = None
+
+
+_EMPTY_VIEW = _RegistryView(version=0, registry=MappingProxyType({}), urls=[], latest=KaiTuple(0, 0, 0))
 
 
 @dataclass(slots=True)
@@ -91,52 +381,109 @@ class SigilStateStore:
 
     Production throughput:
     - Exhale/state are cached and recomputed ONLY after inhale mutates the registry.
+    - Reads are lock-free (RCU-style): one load of the published `_view` gives a
+      consistent registry + order + caches. Writers copy-on-write under
+      `_write_lock` and publish a new view with a single attribute store.
     """
 
     base_origin: str
     persist_path: Path | None
 
-    _lock: threading.RLock
-    _registry: dict[str, SigilPayloadLoose]
+    # current published registry version; readers load it once, no lock
+    _view: _RegistryView
+    # writers only (inhale/load); also guards the writer-side indexes below
+    _write_lock: threading.Lock
+    # one lazy seal/state build per view, even when readers race for it
+    _cache_lock: threading.Lock
 
     # optional cap for runaway registries (0 = disabled)
     _prune_keep: int
 
-    # cache (valid until next mutate)
-    _cache_urls: list[str] | None
-    _cache_seal: str
-    _cache_state: SigilState | None
+    # running Kai maximum across the registry. Valid because (for non-negative
+    # Kai fields) a URL's Kai tuple never decreases: merge keeps the newer payload
+    # and only fills missing fields; prune keeps the newest entries.
+    _latest: KaiTuple
+
+    # precomputed packed Kai sort key per URL (kept in step with the registry)
+    _sort_keys: dict[str, int | None]
+    # incremental Kai order: (sort_key, url) ascending — Kai-desc export is the
+    # reverse walk. Holds every URL whose key packs (see kai_sort_int).
+    _order: SortedList
+
+    # background persistence (only when persist_path is set):
+    # inhale enqueues a "dirty" token; one writer thread coalesces pending saves
+    _persist_queue: queue.Queue[int] | None
+    _persisted_version: int
+    # debounce window: a burst of inhales inside it lands as ONE save
+    _persist_debounce_s: float
+
+    # append-only persistence: <persist_path> is the snapshot, <persist_path>.log
+    # holds one record per URL changed since. The log header carries the snapshot
+    # generation it applies to (a log from another generation is stale).
+    _pending_changes: set[str]
+    _log_gen: int
+    _log_valid: bool
+    _log_size: int
+    _snapshot_size: int
+    # persister thread only: url → (payload, its JSON bytes). An entry is valid
+    # while the registry still holds that exact payload object (payloads are
+    # never mutated once published), so no invalidation hook is needed.
+    _payload_json: dict[str, tuple[SigilPayloadLoose, bytes]]
 
     def __init__(self, *, base_origin: str | None = None, persist_path: str | None = None) -> None:
         self.base_origin = (base_origin or _default_base_origin()).strip()
         self.persist_path = Path(persist_path).expanduser().resolve() if persist_path else None
-        self._lock = threading.RLock()
-        self._registry = {}
+        self._view = _EMPTY_VIEW
+        self._write_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
         self._prune_keep = _safe_int("KAI_REGISTRY_KEEP", 0)
-
-        self._cache_urls = None
-        self._cache_seal = ""
-        self._cache_state = None
+        self._latest = KaiTuple(0, 0, 0)
+        self._sort_keys = {}
+        self._order = SortedList()
+
+        self._persist_queue = None
+        self._persisted_version = -1
+        self._persist_debounce_s = max(0, _safe_int("KAI_PERSIST_DEBOUNCE_MS", 25)) / 1000.0
+        self._pending_changes = set()
+        self._log_gen = 0
+        self._log_valid = False
+        self._log_size = 0
+        self._snapshot_size = 0
+        self._payload_json = {}
 
         if self.persist_path:
             self._load_from_disk_best_effort()
-            self._invalidate_cache()
+            self._persisted_version = self._view.version
+            self._start_persister()
 
-    def _invalidate_cache(self) -> None:
-        self._cache_urls = None
-        self._cache_seal = ""
-        self._cache_state = None
+    def _publish(self, reg: dict[str, SigilPayloadLoose]) -> None:
+        """
+        Make `reg` the current version (caller holds _write_lock).
+        `reg` is owned by the view from here on: never mutate it again.
+        """
+        self._view = _RegistryView(
+            version=self._view.version + 1,
+            registry=MappingProxyType(reg),
+            urls=self._ordered_urls(reg),
+            latest=self._latest,
+        )
 
     # ──────────────────────────────────────────────────────────────────
     # Persistence (optional)
     # ──────────────────────────────────────────────────────────────────
 
+    @property
+    def _log_path(self) -> Path:
+        assert self.persist_path is not None
+        return self.persist_path.with_suffix(self.persist_path.suffix + ".log")
+
     def _load_from_disk_best_effort(self) -> None:
         """
         Attempt load in this order:
-        1) main file
-        2) backup file
+        1) main snapshot
+        2) backup snapshot
         Otherwise: empty registry.
+        Then replay the ops log on top (only if it belongs to the loaded snapshot).
         """
         assert self.persist_path is not None
         main = self.persist_path
@@ -146,120 +493,320 @@ class SigilStateStore:
         if obj is None:
             obj = _load_json_file_best_effort(bak)
 
+        try:
+            self._snapshot_size = main.stat().st_size
+        except Exception:
+            self._snapshot_size = 0
+
+        snap_gen = 0
         next_reg: dict[str, SigilPayloadLoose] = {}
         if isinstance(obj, dict):
+            g = obj.get("log_gen")
+            snap_gen = g if isinstance(g, int) else 0
+            trusted = obj.get("spec") == "KKS-1.0"
             reg = obj.get("registry")
             if isinstance(reg, dict):
-                for url, payload_obj in reg.items():
-                    if not isinstance(url, str) or not url.strip():
-                        continue
-                    if not isinstance(payload_obj, dict):
-                        continue
+                next_reg = _registry_from_disk(reg, trusted=trusted)
+
+        log_gen, records, clean_size = _read_log_best_effort(self._log_path)
+        self._log_gen = snap_gen
+        self._log_valid = log_gen == snap_gen
+        if self._log_valid:
+            for rec in records:
+                url = rec["u"]
+                payload_obj = rec.get("p")
+                if payload_obj is None:
+                    next_reg.pop(url, None)
+                    continue
+                if not isinstance(payload_obj, dict):
+                    continue
+                try:
+                    # the log is only ever written by this service (generation-matched)
+                    next_reg[url] = _payload_from_disk(payload_obj, trusted=True)
+                except Exception:
+                    continue
+            self._log_size = clean_size
+            if not self._repair_log_tail(clean_size):
+                # torn tail we could not cut off: rewrite the whole log on next save
+                # (appending would glue the next record onto the torn one)
+                self._log_valid = False
+                self._pending_changes = set(next_reg)
+
+        with self._write_lock:
+            self._latest = latest_kai(next_reg.values())
+            self._sort_keys = {u: kai_sort_int(p) for (u, p) in next_reg.items()}
+            self._order = SortedList((k, u) for (u, k) in self._sort_keys.items() if k is not None)
+            self._publish(next_reg)
+
+    def _repair_log_tail(self, clean_size: int) -> bool:
+        """Truncate a torn final record (crash mid-append) off the ops log."""
+        try:
+            if self._log_path.stat().st_size == clean_size:
+                return True
+            if clean_size <= 0:
+                return False
+            os.truncate(self._log_path, clean_size)
+            return True
+        except OSError:
+            return False
+
+    def _start_persister(self) -> None:
+        # maxsize=1: at most one save pending; further requests coalesce into it
+        # (the worker snapshots the registry when it runs, not when enqueued).
+        self._persist_queue = queue.Queue(maxsize=1)
+        t = threading.Thread(target=self._persist_loop, name="kai-persist", daemon=True)
+        t.start()
+
+    def _persist_loop(self) -> None:
+        q = self._persist_queue
+        assert q is not None
+        while True:
+            q.get()
+            try:
+                if self._persist_debounce_s:
+                    time.sleep(self._persist_debounce_s)
+                    # requests made during the window are covered by this save
                     try:
-                        next_reg[url] = SigilPayloadLoose.model_validate(payload_obj)
-                    except Exception:
-                        continue
+                        q.get_nowait()
+                        q.task_done()
+                    except queue.Empty:
+                        pass
+                self._save_to_disk_best_effort()
+            except Exception:
+                # keep the worker alive: a dead persister stops saving silently
+                # and leaves flush() blocked on a task nobody will finish
+                _log.exception("kai-persist: save failed")
+            finally:
+                q.task_done()
+
+    def _request_persist(self) -> None:
+        q = self._persist_queue
+        if q is None:
+            return
+        try:
+            q.put_nowait(self._view.version)
+        except queue.Full:
+            pass  # a pending save will pick up this version too
 
-        with self._lock:
-            self._registry = next_reg
+    def flush(self) -> None:
+        """
+        Block until every requested save has hit disk.
+        Call on graceful shutdown (pending saves otherwise die with the process).
+        """
+        q = self._persist_queue
+        if q is not None:
+            q.join()
 
     def _save_to_disk_best_effort(self) -> None:
+        """
+        O(changed) save: append one ops-log record per URL changed since the last
+        save; compact into a fresh snapshot once the log outgrows 2× the snapshot.
+        Runs on the persister thread only (single writer of the files).
+        """
         if not self.persist_path:
             return
-        with self._lock:
-            obj: dict[str, Any] = {
-                "spec": "KKS-1.0",
-                "registry": {u: p.model_dump(exclude_none=False) for (u, p) in self._registry.items()},
-            }
+        with self._write_lock:
+            # pending changes and the view are published together: take both
+            view = self._view
+            if view.version == self._persisted_version:
+                return
+            changes = self._pending_changes
+            self._pending_changes = set()
+
+        reg = view.registry
         try:
-            _atomic_write_text(self.persist_path, dumps_canonical_json(obj), keep_backup=True)
+            data = b"".join(_log_line(u, self._payload_bytes(u, reg.get(u))) for u in sorted(changes))
+            if self._log_valid:
+                _append_bytes_durable(self._log_path, data)
+                self._log_size += len(data)
+            else:
+                # no log for this snapshot generation yet (or a stale one): start fresh
+                data = _log_header(self._log_gen) + data
+                _atomic_write_bytes(self._log_path, data, keep_backup=False)
+                self._log_valid = True
+                self._log_size = len(data)
         except Exception:
-            # persistence failure must never break the API
+            # persistence failure must never break the API; retry these next save
+            with self._write_lock:
+                self._pending_changes |= changes
             return
+        self._persisted_version = view.version
 
-    def _maybe_prune(self) -> None:
-        keep = self._prune_keep
-        if keep <= 0:
-            return
-        if len(self._registry) <= keep:
+        if self._log_size > 2 * self._snapshot_size:
+            self._compact_best_effort()
+
+    def _compact_best_effort(self) -> None:
+        """
+        Fold the ops log into a new snapshot generation, then reset the log.
+        Crash-safe: a log left over from the previous generation is ignored at load.
+        """
+        assert self.persist_path is not None
+        gen = self._log_gen + 1
+        reg = self._view.registry
+        # unchanged payloads reuse their memoized bytes: only new ones serialize
+        chunks = _snapshot_chunks(gen, ((u, self._payload_bytes(u, p)) for (u, p) in sorted(reg.items())))
+        if len(self._payload_json) > len(reg):
+            # drop memo entries for URLs pruned since
+            self._payload_json = {u: self._payload_json[u] for u in reg}
+        try:
+            _atomic_write_chunks(self.persist_path, chunks, keep_backup=True)
+            self._log_gen = gen
+            self._log_valid = False
+            self._snapshot_size = sum(map(len, chunks))
+            header = _log_header(gen)
+            _atomic_write_bytes(self._log_path, header, keep_backup=False)
+            self._log_valid = True
+            self._log_size = len(header)
+        except Exception:
             return
 
-        ordered = build_ordered_urls(self._registry)  # Kai-desc
+    def _payload_bytes(self, url: str, p: SigilPayloadLoose | None) -> bytes | None:
+        """Memoized payload JSON (persister thread only); None for a removed URL."""
+        memo = self._payload_json
+        if p is None:
+            memo.pop(url, None)
+            return None
+        hit = memo.get(url)
+        if hit is not None and hit[0] is p:
+            return hit[1]
+        pj = _payload_json_bytes(p)
+        memo[url] = (p, pj)
+        return pj
+
+    def _index_changes(self, reg: Mapping[str, SigilPayloadLoose], urls: set[str]) -> None:
+        """
+        O(changed · log N) upkeep of per-registry indexes after a merge:
+        running-max latest Kai moment, packed sort keys, sorted Kai order.
+        """
+        latest = self._latest.as_tuple()
+        sort_keys = self._sort_keys
+        order = self._order
+        for url in urls:
+            old = sort_keys.get(url)
+            if old is not None:
+                order.discard((old, url))
+            p = reg.get(url)
+            if p is None:
+                sort_keys.pop(url, None)
+                continue
+            k = kai_sort_int(p)
+            sort_keys[url] = k
+            if k is not None:
+                order.add((k, url))
+            kt = kai_key(p)
+            if kt > latest:
+                self._latest = KaiTuple(*kt)
+                latest = kt
+
+    def _maybe_prune(self, reg: dict[str, SigilPayloadLoose]) -> dict[str, SigilPayloadLoose]:
+        """Keep the newest `_prune_keep` entries (`reg` is the writer's private copy)."""
+        keep = self._prune_keep
+        if keep <= 0:
+            return reg
+        if len(reg) <= keep:
+            return reg
+
+        excess = len(reg) - keep
+        if len(self._order) == len(reg):
+            # the oldest entries are the low end of the ascending Kai index:
+            # O(excess · log N), no full walk or registry rebuild
+            dropped = list(map(_index_url, self._order[:excess]))
+            del self._order[:excess]
+            for url in dropped:
+                del reg[url]
+                self._sort_keys.pop(url, None)
+            if self.persist_path:
+                self._pending_changes.update(dropped)
+            return reg
+
+        ordered = self._ordered_urls(reg)  # Kai-desc
         next_reg: dict[str, SigilPayloadLoose] = {}
         for url in ordered[:keep]:
-            p = self._registry.get(url)
+            p = reg.get(url)
             if p is not None:
                 next_reg[url] = p
-        self._registry = next_reg
+        for url in ordered[keep:]:
+            k = self._sort_keys.pop(url, None)
+            if k is not None:
+                self._order.discard((k, url))
+        if self.persist_path:
+            self._pending_changes.update(ordered[keep:])
+        return next_reg
+
+    def _ordered_urls(self, reg: Mapping[str, SigilPayloadLoose]) -> list[str]:
+        """
+        Kai-desc export from the incremental index: O(N) walk, no sort.
+        Falls back to a full sort only if some key could not be packed.
+        """
+        if len(self._order) == len(reg):
+            return list(map(_index_url, reversed(self._order)))
+        return build_ordered_urls(reg)
 
     # ──────────────────────────────────────────────────────────────────
-    # Cache builders (called only when needed)
+    # Lazy per-view caches (called only when needed)
     # ──────────────────────────────────────────────────────────────────
 
-    def _ensure_urls_cache(self) -> None:
-        if self._cache_urls is not None:
-            return
-        ordered = build_ordered_urls(self._registry)  # Kai-desc
-        self._cache_urls = ordered
-        self._cache_seal = _compute_seal_from_urls(ordered)
-
-    def _ensure_state_cache(self) -> None:
-        if self._cache_state is not None:
-            return
-        self._ensure_urls_cache()
-        assert self._cache_urls is not None
-
-        entries: list[SigilEntry] = []
-        payloads: list[SigilPayloadLoose] = []
-
-        for url in self._cache_urls:
-            p = self._registry.get(url)
-            if p is None:
-                continue
-            entries.append(SigilEntry(url=url, payload=p))
-            payloads.append(p)
-
-        if payloads:
-            lt = latest_kai(payloads)
-            latest = KaiMoment(pulse=int(lt.pulse), beat=int(lt.beat), stepIndex=int(lt.stepIndex))
-        else:
-            latest = KaiMoment()
-
-        self._cache_state = SigilState(
-            spec="KKS-1.0",
-            total_urls=len(entries),
-            latest=latest,
-            state_seal=self._cache_seal,
-            registry=entries,
-            urls=self._cache_urls,
-        )
+    # A view's caches are filled at most once; readers racing on a fresh view
+    # wait on _cache_lock for the first build instead of repeating the O(N) work.
+
+    def _view_seal(self, view: _RegistryView) -> str:
+        seal = view.seal
+        if seal is None:
+            with self._cache_lock:
+                seal = view.seal
+                if seal is None:
+                    seal = _compute_seal_from_urls(view.urls)
+                    view.seal = seal
+        return seal
+
+    def _view_state(self, view: _RegistryView) -> SigilState:
+        state = view.state
+        if state is None:
+            seal = self._view_seal(view)
+            with self._cache_lock:
+                state = view.state
+                if state is None:
+                    state = _build_state(view.urls, view.registry, seal, view.latest)
+                    view.state = state
+        return state
 
     # ──────────────────────────────────────────────────────────────────
     # Breath actions
     # ──────────────────────────────────────────────────────────────────
 
-    def inhale_files(self, files: list[tuple[str, bytes]]) -> InhaleReport:
+    def inhale_files(self, files: list[tuple[str, JsonBlob]]) -> InhaleReport:
         """
         INHALE: merge uploaded krystal JSON files into the global registry.
+        Blobs may be bytes or any buffer (memoryview / mmap) — parsed in place.
         Returns a Determinate report.
         """
-        with self._lock:
-            report = inhale_files_into_registry(self._registry, files, base_origin=self.base_origin)
-            self._maybe_prune()
-            self._invalidate_cache()
-
-        self._save_to_disk_best_effort()
+        # Parse stage runs outside the lock (pure; files parsed sequentially)
+        parsed = parse_krystal_files(files, base_origin=self.base_origin)
+
+        with self._write_lock:
+            # copy-on-write: readers keep using the published version meanwhile
+            reg = dict(self._view.registry)
+            report = merge_parsed_into_registry(reg, parsed, base_origin=self.base_origin)
+            if report.changed:
+                self._index_changes(reg, report.changed)
+                if self.persist_path:
+                    self._pending_changes |= report.changed
+            size = len(reg)
+            # prune even when nothing merged (a loaded registry may exceed a new cap)
+            reg = self._maybe_prune(reg)
+            if report.changed or len(reg) != size:
+                self._publish(reg)
+
+        # Persist off the request path (coalesced background save)
+        self._request_persist()
         return report
 
     def exhale_urls(self) -> list[str]:
         """
         EXHALE (urls mode): SigilExplorer-compatible export list.
-        Cached (fast) — recomputed only after inhale.
+        Lock-free — computed once per registry version (at publish).
         """
-        with self._lock:
-            self._ensure_urls_cache()
-            assert self._cache_urls is not None
-            return self._cache_urls
+        return self._view.urls
 
     def exhale_urls_page(self, *, offset: int, limit: int) -> tuple[list[str], int]:
         """
@@ -268,30 +815,22 @@ class SigilStateStore:
         """
         o = max(0, int(offset))
         l = max(1, int(limit))
-        with self._lock:
-            self._ensure_urls_cache()
-            assert self._cache_urls is not None
-            total = len(self._cache_urls)
-            return (self._cache_urls[o : o + l], total)
+        urls = self._view.urls
+        return (urls[o : o + l], len(urls))
 
     def get_seal(self) -> str:
         """
-        Fast Determinate seal (ETag candidate). Cached.
+        Fast Determinate seal (ETag candidate). Cached per registry version.
         """
-        with self._lock:
-            self._ensure_urls_cache()
-            return self._cache_seal
+        return self._view_seal(self._view)
 
     def get_state(self) -> SigilState:
         """
         EXHALE (state mode): full merged registry (Kai-ordered).
         Cached (fast) — recomputed only after inhale.
         """
-        with self._lock:
-            self._ensure_state_cache()
-            assert self._cache_state is not None
-            # defensive copy so callers can’t mutate cached object
-            return self._cache_state.model_copy(deep=False)
+        # defensive copy so callers can’t mutate cached object
+        return self._view_state(self._view).model_copy(deep=False)
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -299,6 +838,7 @@ class SigilStateStore:
 # ──────────────────────────────────────────────────────────────────────
 
 _STORE: SigilStateStore | None = None
+_STORE_LOCK = threading.Lock()
 
 
 def get_store() -> SigilStateStore:
@@ -307,12 +847,22 @@ def get_store() -> SigilStateStore:
       - KAI_BASE_ORIGIN: base for relative URLs / bare tokens
       - KAI_STATE_PATH: if set, enables persistence to disk
       - KAI_REGISTRY_KEEP: optional cap (keep newest N; 0 disables)
+      - KAI_PERSIST_DEBOUNCE_MS: background save debounce window (default 25; 0 disables)
+
+    Thread-safe: exactly one store per process even if first calls race.
+    The app binds it once at startup (app.state.store); routes read that.
     """
     global _STORE
-    if _STORE is None:
-        persist = os.getenv("KAI_STATE_PATH")
-        _STORE = SigilStateStore(
-            base_origin=_default_base_origin(),
-            persist_path=persist.strip() if persist else None,
-        )
-    return _STORE
+    store = _STORE
+    if store is not None:
+        return store
+    with _STORE_LOCK:
+        if _STORE is None:
+            persist = os.getenv("KAI_STATE_PATH")
+            _STORE = SigilStateStore(
+                base_origin=_default_base_origin(),
+                persist_path=persist.strip() if persist else None,
+            )
+            # drain pending background saves on interpreter exit
+            atexit.register(_STORE.flush)
+        return _STORE
@@ -5,6 +5,7 @@ import base64
 import json
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Iterable
 from urllib.parse import ParseResult, parse_qs, quote, unquote, urljoin, urlsplit, urlunsplit
 
@@ -38,6 +39,13 @@ class UrlPayloadHit:
     payload: SigilPayloadLoose
 
 
+# Pure string → string helpers below are memoized: the same URLs / add= values
+# recur constantly (witness chains, duplicate hits, re-inhaled krystals).
+# base_origin is part of the cache key, so different origins never collide.
+_URL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def safe_decode_uri_component(v: str) -> str:
     try:
         return unquote(v)
@@ -131,13 +139,19 @@ def _canonicalize_parsed(u: ParseResult) -> str:
     """
     Determinate canonicalization, close to browser `new URL(...).toString()`:
     - scheme + netloc are lowercased (URL semantics)
-    - everything else preserved as-is
+    - everything else preserved as-is, except that whitespace-only query/fragment
+      parts are dropped and the result is stripped: otherwise dropping an empty
+      `?`/`#` can expose whitespace that canonicalize_url's input strip removes on
+      a second pass (a canonical key must canonicalize to itself)
     """
     scheme = (u.scheme or "").lower()
     netloc = (u.netloc or "").lower()
-    return urlunsplit((scheme, netloc, u.path or "", u.query or "", u.fragment or ""))
+    query = u.query if (u.query or "").strip() else ""
+    fragment = u.fragment if (u.fragment or "").strip() else ""
+    return urlunsplit((scheme, netloc, u.path or "", query, fragment)).strip()
 
 
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def canonicalize_url(url: str, *, base_origin: str) -> str:
     """
     Make a stable absolute URL key.
@@ -274,6 +288,19 @@ def extract_payload_from_url(url: str, *, base_origin: str) -> UrlPayloadHit | N
     return None
 
 
+def extract_payloads_from_urls(urls: Iterable[str], *, base_origin: str) -> dict[str, SigilPayloadLoose]:
+    """
+    Batch form of extract_payload_from_url: url_key → payload for every URL that
+    carries a decodable token (others are skipped). First hit per url_key wins.
+    """
+    out: dict[str, SigilPayloadLoose] = {}
+    for url in urls:
+        hit = extract_payload_from_url(url, base_origin=base_origin)
+        if hit is not None and hit.url_key not in out:
+            out[hit.url_key] = hit.payload
+    return out
+
+
 def extract_many_payloads_from_any(obj: Any, *, base_origin: str) -> list[UrlPayloadHit]:
     """
     Walk arbitrary JSON structures and extract payload URLs/tokens wherever found.
@@ -1,13 +1,15 @@
 # app/core/witness.py
 from __future__ import annotations
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 from urllib.parse import parse_qs, urlsplit
 
 from app.core.url_extract import (
     canonicalize_url,
-    extract_payload_from_url,
+    extract_payloads_from_urls,
     looks_like_bare_token,
     safe_decode_uri_component,
 )
@@ -30,12 +32,15 @@ class WitnessCtx:
     parentUrl: str | None = None
 
 
-def _extract_add_values_from_url(url: str) -> list[str]:
+@lru_cache(maxsize=4096)
+def _extract_add_values_from_url(url: str) -> tuple[str, ...]:
     """
     Extract raw add= values from BOTH query and fragment.
 
     Mirrors SigilExplorer behavior:
       rawAdds = [...u.searchParams.getAll("add"), ...hashParams.getAll("add")]
+
+    Pure in `url`: memoized (chain URLs recur across hits and re-inhales).
     """
     u = urlsplit(url)
 
@@ -51,7 +56,7 @@ def _extract_add_values_from_url(url: str) -> list[str]:
         h = parse_qs(frag, keep_blank_values=False)
         raw_adds.extend([v for v in (h.get("add") or []) if isinstance(v, str)])
 
-    return [a for a in raw_adds if a and a.strip()]
+    return tuple(a for a in raw_adds if a and a.strip())
 
 
 def extract_witness_chain_from_url(url: str, *, base_origin: str) -> list[str]:
@@ -69,11 +74,8 @@ def extract_witness_chain_from_url(url: str, *, base_origin: str) -> list[str]:
     if not abs_url:
         return []
 
-    raw_adds = _extract_add_values_from_url(abs_url)
-    out: list[str] = []
-    seen: set[str] = set()
-
-    for raw in raw_adds:
+    links: list[str] = []
+    for raw in _extract_add_values_from_url(abs_url):
         decoded = safe_decode_uri_component(str(raw)).strip()
         if not decoded:
             continue
@@ -82,14 +84,10 @@ def extract_witness_chain_from_url(url: str, *, base_origin: str) -> list[str]:
         if looks_like_bare_token(decoded):
             decoded = f"/stream/p/{decoded}"
 
-        link = canonicalize_url(decoded, base_origin=base_origin)
-        if not link:
-            continue
+        links.append(canonicalize_url(decoded, base_origin=base_origin))
 
-        if link in seen:
-            continue
-        seen.add(link)
-        out.append(link)
+    # in-order dedup in one C-level pass (first occurrence wins); drop empties
+    out = [link for link in dict.fromkeys(links) if link]
 
     if len(out) > WITNESS_ADD_MAX:
         out = out[-WITNESS_ADD_MAX:]
@@ -114,13 +112,14 @@ def derive_witness_context(url: str, *, base_origin: str) -> WitnessCtx:
 def merge_derived_context(payload: SigilPayloadLoose, ctx: WitnessCtx) -> SigilPayloadLoose:
     """
     Merge derived witness context into payload WITHOUT overriding explicit payload fields.
+    Always returns a fresh (shallow) copy.
     """
-    next_p = SigilPayloadLoose.model_validate(payload.model_dump())
-    if ctx.originUrl and not next_p.originUrl:
-        next_p.originUrl = ctx.originUrl
-    if ctx.parentUrl and not next_p.parentUrl:
-        next_p.parentUrl = ctx.parentUrl
-    return next_p
+    update: dict[str, str] = {}
+    if ctx.originUrl and not payload.originUrl:
+        update["originUrl"] = ctx.originUrl
+    if ctx.parentUrl and not payload.parentUrl:
+        update["parentUrl"] = ctx.parentUrl
+    return payload.model_copy(update=update)
 
 
 def _soft_patch_topology(
@@ -131,29 +130,24 @@ def _soft_patch_topology(
 ) -> tuple[SigilPayloadLoose, bool]:
     """
     Only fills missing originUrl/parentUrl. Never overwrites.
-    Returns (patched_payload, changed?).
+    Returns (patched_payload, changed?). A patch is a shallow copy — `p` itself
+    is never mutated (it may already be published in a registry view).
     """
-    changed = False
-    next_p = p
-
-    if originUrl and not next_p.originUrl:
-        next_p = SigilPayloadLoose.model_validate(next_p.model_dump())
-        next_p.originUrl = originUrl
-        changed = True
+    update: dict[str, str] = {}
+    if originUrl and not p.originUrl:
+        update["originUrl"] = originUrl
+    if parentUrl and not p.parentUrl:
+        update["parentUrl"] = parentUrl
 
-    if parentUrl and not next_p.parentUrl:
-        if not changed:
-            next_p = SigilPayloadLoose.model_validate(next_p.model_dump())
-        next_p.parentUrl = parentUrl
-        changed = True
-
-    return next_p, changed
+    if not update:
+        return p, False
+    return p.model_copy(update=update), True
 
 
 def synthesize_edges_from_witness_chain(
     chain: list[str],
     leaf_url: str,
-    reg: dict[str, SigilPayloadLoose],
+    reg: MutableMapping[str, SigilPayloadLoose],
     *,
     base_origin: str,
 ) -> int:
@@ -185,25 +179,39 @@ def synthesize_edges_from_witness_chain(
     if not chain_abs:
         return 0
 
-    origin = chain_abs[0]
     leaf_abs = canonicalize_url(leaf_url, base_origin=base_origin)
     if not leaf_abs:
         return 0
 
-    changed = 0
+    return synthesize_edges_from_canonical_chain(chain_abs, leaf_abs, reg, base_origin=base_origin)
+
+
+def synthesize_edges_from_canonical_chain(
+    chain_abs: list[str],
+    leaf_abs: str,
+    reg: MutableMapping[str, SigilPayloadLoose],
+    *,
+    base_origin: str,
+) -> int:
+    """
+    synthesize_edges_from_witness_chain for inputs that are already canonical
+    (non-empty chain of non-empty URL keys, canonical leaf), e.g. a chain from
+    extract_witness_chain_from_url and its canonical carrier URL: no re-canonicalization.
+    """
+    if not chain_abs or not leaf_abs:
+        return 0
 
-    def ensure(url: str) -> None:
-        nonlocal changed
-        if url in reg:
-            return
-        hit = extract_payload_from_url(url, base_origin=base_origin)
-        if hit is None:
-            return
-        reg[hit.url_key] = hit.payload
-        changed += 1
+    origin = chain_abs[0]
+    changed = 0
 
-    # Ensure origin exists (if decodable)
-    ensure(origin)
+    # Ensure every chain node + the leaf exists (if decodable): one batch decode
+    # of just the missing URLs, before any patching (patches never add keys).
+    missing = [u for u in dict.fromkeys(chain_abs + [leaf_abs]) if u not in reg]
+    if missing:
+        for url_key, payload in extract_payloads_from_urls(missing, base_origin=base_origin).items():
+            if url_key not in reg:
+                reg[url_key] = payload
+                changed += 1
 
     # Patch origin: originUrl=self (soft), parentUrl untouched unless missing (we leave missing)
     if origin in reg:
@@ -218,7 +226,6 @@ def synthesize_edges_from_witness_chain(
         child = chain_abs[i]
         parent = chain_abs[i - 1]
 
-        ensure(child)
         if child in reg:
             p = reg[child]
             patched, did = _soft_patch_topology(p, originUrl=origin, parentUrl=parent)
@@ -226,9 +233,6 @@ def synthesize_edges_from_witness_chain(
                 reg[child] = patched
                 changed += 1
 
-    # Ensure leaf exists (it should, but keep robust)
-    ensure(leaf_abs)
-
     # Patch leaf with origin + parent=last chain entry
     if leaf_abs in reg:
         leaf_parent = chain_abs[-1]
@@ -4,6 +4,8 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, Request
@@ -11,6 +13,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
 
 from app.api.routes import router as sigils_router
+from app.core.state_store import get_store
 
 # ──────────────────────────────────────────────────────────────────────────────
 # KAIROS SIGIL MERGE API — “LAH-MAH-TOR · THE PORTAL”
@@ -84,6 +87,8 @@ _CORS_ALLOW_HEADERS_ENV = "KAI_CORS_ALLOW_HEADERS"
 _CORS_EXPOSE_HEADERS_ENV = "KAI_CORS_EXPOSE_HEADERS"
 _CORS_MAX_AGE_ENV = "KAI_CORS_MAX_AGE"
 
+_TRUTHY: frozenset[str] = frozenset({"1", "true", "yes", "on"})
+
 
 def _canonical_json(obj: Any) -> str:
     # Canonical JSON: stable key order, stable separators, UTF-8 safe.
@@ -106,21 +111,21 @@ def _split_env_list(value: str | None) -> list[str]:
 
 
 def _truthy_env(value: str | None) -> bool:
-    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
+    return (value or "").strip().lower() in _TRUTHY
 
 
 def _cors_config() -> dict[str, Any]:
-    allow_origins = _split_env_list(os.getenv(_CORS_ALLOW_ORIGINS_ENV, ""))
-    allow_origin_regex = os.getenv(_CORS_ALLOW_ORIGIN_REGEX_ENV, "").strip() or None
-    allow_credentials = _truthy_env(os.getenv(_CORS_ALLOW_CREDENTIALS_ENV, "true"))
-    allow_methods = _split_env_list(os.getenv(_CORS_ALLOW_METHODS_ENV, "")) or ["*"]
-    allow_headers = _split_env_list(os.getenv(_CORS_ALLOW_HEADERS_ENV, "")) or ["*"]
-    expose_headers = _split_env_list(os.getenv(_CORS_EXPOSE_HEADERS_ENV, "")) or [
+    allow_origins = _split_env_list(os.environ.get(_CORS_ALLOW_ORIGINS_ENV, ""))
+    allow_origin_regex = os.environ.get(_CORS_ALLOW_ORIGIN_REGEX_ENV, "").strip() or None
+    allow_credentials = _truthy_env(os.environ.get(_CORS_ALLOW_CREDENTIALS_ENV, "true"))
+    allow_methods = _split_env_list(os.environ.get(_CORS_ALLOW_METHODS_ENV, "")) or ["*"]
+    allow_headers = _split_env_list(os.environ.get(_CORS_ALLOW_HEADERS_ENV, "")) or ["*"]
+    expose_headers = _split_env_list(os.environ.get(_CORS_EXPOSE_HEADERS_ENV, "")) or [
         "ETag",
         "Cache-Control",
         "Content-Length",
     ]
-    max_age_raw = os.getenv(_CORS_MAX_AGE_ENV, "").strip()
+    max_age_raw = os.environ.get(_CORS_MAX_AGE_ENV, "").strip()
     max_age = int(max_age_raw) if max_age_raw.isdigit() else 600
 
     if not allow_origins and not allow_origin_regex:
@@ -692,9 +697,22 @@ curl -s "__ORIGIN__/openapi.json" | jq '.info'
 """
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # One store per process, built before the first request (no lazy init race)
+    store = get_store()
+    app.state.store = store
+    try:
+        yield
+    finally:
+        # drain pending background saves before the worker exits
+        store.flush()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=SERVICE_NAME,
+        lifespan=_lifespan,
         version=VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
@@ -15,9 +15,11 @@ class SigilPayloadLoose(BaseModel):
     - Normalizes common alias keys into canonical Kai fields.
     - Kai-time ordering is derived from (pulse, beat, stepIndex) ONLY.
     - Chronos fields (e.g., ts, createdAt) are accepted but NEVER used for ordering.
+    - Frozen: payloads are shared between registry views and memoized by
+      identity (dumps, JSON bytes); derive changes with model_copy(update=...).
     """
 
-    model_config = ConfigDict(extra="allow", populate_by_name=True)
+    model_config = ConfigDict(extra="allow", populate_by_name=True, frozen=True)
 
     # Canonical Kai fields
     pulse: int | None = None
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, RootModel, computed_field
 
 from app.models.payload import SigilPayloadLoose
 
@@ -104,6 +104,13 @@ class SigilState(BaseModel):
     urls: list[str] = Field(default_factory=list)
 
 
+class RegistryModel(RootModel[dict[str, SigilPayloadLoose]]):
+    """
+    Whole persisted registry (url → payload) as ONE model: validating it runs
+    the per-entry loop inside pydantic-core instead of Python.
+    """
+
+
 class InhaleReport(BaseModel):
     """Internal merge report from one inhale run (across uploaded files)."""
 
@@ -116,6 +123,9 @@ class InhaleReport(BaseModel):
 
     errors: list[str] = Field(default_factory=list)
 
+    # URL keys written by this run (internal bookkeeping; never serialized)
+    changed: set[str] = Field(default_factory=set, exclude=True)
+
 
 class InhaleResponse(BaseModel):
     status: Literal["ok", "error"] = "ok"
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.core.jsonio import dumps_canonical_json
+
+
+def _stdlib(obj: object) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"b": 1, "a": [1.5, None, "ü"], "c": {"z": True, "y": 2**70}},
+        {"pulse": float("nan")},
+        {"x": [1, {"deep": float("inf")}], "y": -float("inf")},
+        [float("nan"), 0.1],
+    ],
+)
+def test_canonical_dump_matches_stdlib(obj: object) -> None:
+    assert dumps_canonical_json(obj) == _stdlib(obj)
+
+
+def test_non_finite_floats_are_not_written_as_null() -> None:
+    assert dumps_canonical_json({"a": float("nan"), "b": float("-inf")}) == b'{"a":NaN,"b":-Infinity}'
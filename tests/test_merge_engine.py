@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from app.core.kai_time import latest_kai
+from app.core.merge_engine import build_ordered_urls, merge_parsed_into_registry, parse_krystal_files
+from app.core.state_store import SigilStateStore, _build_state, _compute_seal_from_urls
+from app.models.payload import SigilPayloadLoose
+from app.models.state import SigilState
+
+BASE_ORIGIN = "https://kaiklok.com"
+KRYSTAL = Path(__file__).resolve().parents[1] / "memory_krystal_test.json"
+
+
+def _registry() -> dict[str, SigilPayloadLoose]:
+    reg: dict[str, SigilPayloadLoose] = {}
+    parsed = parse_krystal_files([("krystal.json", KRYSTAL.read_bytes())], base_origin=BASE_ORIGIN)
+    merge_parsed_into_registry(reg, parsed, base_origin=BASE_ORIGIN)
+    return reg
+
+
+def _validated_state(reg: dict[str, SigilPayloadLoose], urls: list[str], seal: str) -> SigilState:
+    lt = latest_kai(reg.values())
+    return SigilState.model_validate(
+        {
+            "spec": "KKS-1.0",
+            "total_urls": len(urls),
+            "latest": {"pulse": lt.pulse, "beat": lt.beat, "stepIndex": lt.stepIndex},
+            "state_seal": seal,
+            "registry": [{"url": u, "payload": reg[u].model_dump()} for u in urls],
+            "urls": urls,
+        }
+    )
+
+
+def test_constructed_state_matches_validated_state() -> None:
+    reg = _registry()
+    assert reg
+    urls = build_ordered_urls(reg)
+    seal = _compute_seal_from_urls(urls)
+
+    built = _build_state(urls, reg, seal, latest_kai(reg.values()))
+    expected = _validated_state(reg, urls, seal)
+
+    assert built == expected
+    assert built.model_dump(mode="json") == expected.model_dump(mode="json")
+    assert built.latest == expected.latest
+    assert built.state_seal == expected.state_seal
+
+
+def test_store_state_matches_validated_state() -> None:
+    store = SigilStateStore(base_origin=BASE_ORIGIN)
+    store.inhale_files([("krystal.json", KRYSTAL.read_bytes())])
+
+    state = store.get_state()
+    reg = _registry()
+    expected = _validated_state(reg, build_ordered_urls(reg), store.get_seal())
+
+    assert state.model_dump(mode="json") == expected.model_dump(mode="json")
+
+
+def test_empty_state_matches_defaults() -> None:
+    built = _build_state([], {}, _compute_seal_from_urls([]), latest_kai([]))
+    assert built.model_dump(mode="json") == SigilState(state_seal=built.state_seal).model_dump(mode="json")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+KRYSTAL = Path(__file__).resolve().parents[1] / "memory_krystal_test.json"
+
+
+def test_skipped_upload_keeps_earlier_notes() -> None:
+    with TestClient(app) as client:
+        r = client.post(
+            "/sigils/inhale",
+            files=[
+                ("files", ("notes.txt", b"hello", "text/plain")),
+                ("files", ("empty.json", b"", "text/plain")),
+            ],
+        )
+    errors = r.json()["errors"]
+    for name in ("notes.txt", "empty.json"):
+        assert f"{name}: unexpected content-type 'text/plain' (still attempting JSON parse)." in errors
+        assert f"{name}: skipped" in errors
+    assert "notes.txt: not a JSON krystal (must start with '{', '[' or '\"')" in errors
+    assert "empty.json: empty file" in errors
+
+
+def test_small_and_spooled_uploads_inhale_alike() -> None:
+    krystal = KRYSTAL.read_bytes()
+    padded = krystal + b" " * (2 * 1024 * 1024)  # past the multipart spool limit
+    with TestClient(app) as client:
+        small = client.post("/sigils/inhale", files=[("files", ("k.json", krystal, "application/json"))]).json()
+        large = client.post("/sigils/inhale", files=[("files", ("k.json", padded, "application/json"))]).json()
+    assert small["errors"] == [] and large["errors"] == []
+    assert small["crystals_total"] == large["crystals_total"] > 0
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import blake3
+import pytest
+
+from app.core import state_store
+from app.core.jsonio import dumps_canonical_json, loads_json_bytes
+from app.core.state_store import SigilStateStore
+
+KRYSTAL = Path(__file__).resolve().parents[1] / "memory_krystal_test.json"
+URLS = [u for u in json.loads(KRYSTAL.read_bytes()) if isinstance(u, str)]
+
+
+@pytest.fixture(autouse=True)
+def _store_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("KAI_REGISTRY_KEEP", raising=False)
+    monkeypatch.setenv("KAI_PERSIST_DEBOUNCE_MS", "0")
+
+
+def _inhale(store: SigilStateStore, urls: list[str]) -> None:
+    store.inhale_files([("krystal.json", json.dumps(urls).encode("utf-8"))])
+    store.flush()
+
+
+def _log_lines(path: Path) -> list[bytes]:
+    return Path(str(path) + ".log").read_bytes().splitlines()
+
+
+def _log_gen(path: Path) -> int:
+    return loads_json_bytes(_log_lines(path)[0])["log_gen"]
+
+
+def test_reload_replays_log_over_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])  # first save compacts straight into a snapshot
+    _inhale(store, URLS[20:22])
+    assert len(_log_lines(path)) > 1  # the second save went to the log only
+
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state() == store.get_state()
+
+
+def test_log_from_another_generation_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])
+    victim = store.get_state().urls[0]
+
+    stale = {"spec": "KKS-1.0", "log_gen": _log_gen(path) - 1}
+    Path(str(path) + ".log").write_bytes(
+        json.dumps(stale).encode() + b"\n" + json.dumps({"u": victim, "p": None}).encode() + b"\n"
+    )
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert victim in reloaded.get_state().urls
+
+    # the next save starts a log for the current generation; the stale record stays dead
+    _inhale(reloaded, URLS[20:22])
+    again = SigilStateStore(persist_path=str(path))
+    assert again.get_state() == reloaded.get_state()
+    assert victim in again.get_state().urls
+
+
+def test_log_compacts_once_it_outgrows_twice_the_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:2])
+    gen = _log_gen(path)
+
+    _inhale(store, URLS[2:3])  # small append: stays in the log
+    assert _log_gen(path) == gen
+    assert len(_log_lines(path)) > 1
+
+    _inhale(store, URLS[3:60])  # log > 2x snapshot: folded into a new snapshot
+    assert _log_gen(path) == gen + 1
+    assert len(_log_lines(path)) == 1
+    assert loads_json_bytes(path.read_bytes())["log_gen"] == gen + 1
+
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state() == store.get_state()
+
+
+def test_torn_log_tail_does_not_swallow_later_appends(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])
+    _inhale(store, URLS[20:22])
+    with open(str(path) + ".log", "ab") as f:
+        f.write(b'{"u":"https://kaiklok.com/torn","p":{"pul')  # crash mid-append
+
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state() == store.get_state()
+    assert Path(str(path) + ".log").read_bytes().endswith(b"\n")
+
+    _inhale(reloaded, URLS[22:24])
+    again = SigilStateStore(persist_path=str(path))
+    assert again.get_state() == reloaded.get_state()
+    assert again.get_state().total_urls > store.get_state().total_urls
+
+
+def test_unterminated_final_record_is_dropped_in_memory_and_on_disk(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])
+    log = Path(str(path) + ".log")
+    before = log.read_bytes()
+    victim = store.get_state().urls[0]
+    with open(log, "ab") as f:
+        f.write(json.dumps({"u": victim, "p": None}).encode())  # complete JSON, no "\n"
+
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert victim in reloaded.get_state().urls
+    assert log.read_bytes() == before
+
+    again = SigilStateStore(persist_path=str(path))
+    assert again.get_state() == reloaded.get_state()
+
+
+def test_persister_survives_a_failing_save(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])
+
+    real_log_line = state_store._log_line
+    failures = []
+
+    def fail_once(url: str, payload_json: bytes | None) -> bytes:
+        if not failures:
+            failures.append(url)
+            raise RuntimeError("encode failed")
+        return real_log_line(url, payload_json)
+
+    monkeypatch.setattr(state_store, "_log_line", fail_once)
+    _inhale(store, URLS[20:22])  # flush() must return, not hang on a dead worker
+    assert failures
+
+    _inhale(store, URLS[22:24])  # the failed batch is retried with this one
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state() == store.get_state()
+
+
+def test_prune_keeps_the_newest_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    full = SigilStateStore()
+    _inhale(full, URLS)
+    newest = full.get_state().urls[:20]
+
+    monkeypatch.setenv("KAI_REGISTRY_KEEP", "20")
+    capped = SigilStateStore()
+    for i in range(0, len(URLS), 25):
+        _inhale(capped, URLS[i : i + 25])
+    state = capped.get_state()
+    assert state.urls == newest
+    assert state.total_urls == 20
+    assert state.latest == full.get_state().latest
+
+
+def test_noop_inhale_prunes_a_registry_loaded_over_the_cap(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS)
+    newest = store.get_state().urls[:20]
+    assert store.get_state().total_urls > 20
+
+    monkeypatch.setenv("KAI_REGISTRY_KEEP", "20")
+    capped = SigilStateStore(persist_path=str(path))
+    _inhale(capped, URLS[:3])  # merges nothing new
+    assert capped.get_state().urls == newest
+
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state().urls == newest
+
+
+def test_persist_debounce_coalesces_an_inhale_burst(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("KAI_PERSIST_DEBOUNCE_MS", "200")
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS[:20])
+
+    appends: list[bytes] = []
+    real_append = state_store._append_bytes_durable
+
+    def counting_append(p: Path, data: bytes) -> None:
+        appends.append(data)
+        real_append(p, data)
+
+    monkeypatch.setattr(state_store, "_append_bytes_durable", counting_append)
+    for i in range(20, 26, 2):  # a burst well inside one debounce window
+        store.inhale_files([("krystal.json", json.dumps(URLS[i : i + 2]).encode("utf-8"))])
+    store.flush()
+
+    assert len(appends) == 1
+    reloaded = SigilStateStore(persist_path=str(path))
+    assert reloaded.get_state() == store.get_state()
+
+
+def test_snapshot_is_the_canonical_dump_of_the_document(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = SigilStateStore(persist_path=str(path))
+    _inhale(store, URLS)
+
+    raw = path.read_bytes()
+    doc = json.loads(raw)
+    assert list(doc) == ["log_gen", "registry", "spec"]
+    assert raw == dumps_canonical_json(doc)
+    assert raw == json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def test_seal_is_blake3_of_nul_framed_urls() -> None:
+    urls = [f"https://kaiklok.com/s/{i}" for i in range(2 * state_store._SEAL_BATCH + 3)]
+    expected = blake3.blake3("".join(u + "\x00" for u in urls).encode("utf-8")).hexdigest(length=16)
+    assert state_store._compute_seal_from_urls(urls) == expected
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.url_extract import canonicalize_url
+
+BASE_ORIGIN = "https://kaiklok.com"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "b~b ?",
+        "_\t ?",
+        ". ?\t",
+        "\\@ #",
+        "\t&=bP=? #",
+        "p~\t&=bP=? #",
+        "HTTPS://KaiKlok.com/x?a #",
+        "https://kaiklok.com/stream/p~abc?x=1#add=y",
+    ],
+)
+def test_canonicalize_url_is_idempotent(url: str) -> None:
+    key = canonicalize_url(url, base_origin=BASE_ORIGIN)
+    assert canonicalize_url(key, base_origin=BASE_ORIGIN) == key
+
+
+def test_canonicalize_url_keeps_inner_whitespace() -> None:
+    assert canonicalize_url("https://kaiklok.com/x?a #f", base_origin=BASE_ORIGIN) == "https://kaiklok.com/x?a #f"